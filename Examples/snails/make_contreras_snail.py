@@ -6,35 +6,38 @@ def make_contreras_snail(label="snail",
                          c_depth=0.3, c_n = 12, n_depth = 0.5, n = 4, 
                          t = 20, time_step = .25/6, 
                          points_in_circle=20, length = 1, smooth=False,
-                         color="#000000"):
+                         color="#000000", verbose=False):
     
     
-    for obj in bpy.data.objects:
-        bpy.data.objects.remove(obj, do_unlink=True)
+    bpy.data.batch_remove(bpy.data.objects)
     
     t_values = np.arange(0, t, time_step)
     theta_values = np.arange(0, 2 * np.pi, np.pi / points_in_circle)
     
     
+    # Stack three components into a vector, broadcasting scalars against arrays of t and theta
+    def vector(x, y, z):
+        return np.stack(np.broadcast_arrays(x, y, z))
+
     # Define the gamma function
     def gamma(t, b, d, z):
-        return np.array([d * np.sin(t), d * np.cos(t), z]) * np.exp(b * t)
+        return vector(d * np.sin(t), d * np.cos(t), z) * np.exp(b * t)
 
     # Define the T function
     def T(t, b, d, z):
-        numerator = np.array([d * (b * np.sin(t) + np.cos(t)), d * (b * np.cos(t) - np.sin(t)), -b * z])
+        numerator = vector(d * (b * np.sin(t) + np.cos(t)), d * (b * np.cos(t) - np.sin(t)), -b * z)
         denominator = np.sqrt(((b**2) + 1) * (d**2) + (b**2) * (z**2))
         return numerator / denominator
 
     # Define the N function
     def N(t, b):
-        numerator = np.array([b * np.cos(t) - np.sin(t), -b * np.sin(t) - np.cos(t), 0])
+        numerator = vector(b * np.cos(t) - np.sin(t), -b * np.sin(t) - np.cos(t), 0)
         denominator = np.sqrt((b**2) + 1)
         return numerator / denominator
 
     # Define the B function
     def B(t, b, d, z):
-        numerator = np.array([b * z * (b * np.sin(t) + np.cos(t)), b * z * (b * np.cos(t) - np.sin(t)), d * ((b**2) + 1)])
+        numerator = vector(b * z * (b * np.sin(t) + np.cos(t)), b * z * (b * np.cos(t) - np.sin(t)), d * ((b**2) + 1))
         denominator = np.sqrt(((b**2) + 1) * (((b**2) + 1) * (d**2) + (b**2) * (z**2)))
         return numerator / denominator
 
@@ -54,14 +57,16 @@ def make_contreras_snail(label="snail",
         vector_N = ((a * np.sin(theta) * np.cos(phi)) + (np.cos(theta) * np.sin(phi))) * modulation_n * N(t, b)
         vector_B = ((a * np.sin(theta) * np.sin(phi)) - (np.cos(theta) * np.cos(phi))) * modulation_n * B(t, b, d, z)
 
-        return long_ribs * e_term * np.dot(rotation_matrix, vector_N + vector_B)
+        return long_ribs * e_term * np.tensordot(rotation_matrix, vector_N + vector_B, axes=1)
 
     # Define the lambda function with the updated C function
     def lambda_(t, theta, b, d, z, a, phi, psi, c_n, c_depth, n, n_depth):
         return gamma(t, b, d, z) + C(t, theta, b, a, d, z, phi, psi, c_n, c_depth, n, n_depth)
 
-    # the constant helps keep the float from overflowing when converting to blender
-    points = np.array([[lambda_(t, theta, b, d, z, a, phi, psi, c_n, c_depth, n=n, n_depth=n_depth) for theta in theta_values] for t in t_values])
+    # Evaluate every (t, theta) pair at once by broadcasting t down the rows and theta across the
+    # columns, then move the xyz axis last to get a (len(t), len(theta), 3) grid of points
+    points = lambda_(t_values[:, None], theta_values[None, :], b, d, z, a, phi, psi, c_n, c_depth, n=n, n_depth=n_depth)
+    points = points.transpose(1, 2, 0)
 
     # rescale the values to between 0 and 1 so it doesn't cause float overflow when converting to blender
     current_max = np.amax(points)
@@ -73,13 +78,12 @@ def make_contreras_snail(label="snail",
     translation = desired_min - np.amin(scaled_points)
     scaled_points += translation
     points = scaled_points
-    new_max = np.amax(scaled_points)
-    new_min = np.amin(scaled_points)
-
-
 
-    print("Largest Value:", (current_max, new_max))
-    print("Smallest Value:",(current_min, new_min))
+    if verbose:
+        new_max = np.amax(scaled_points)
+        new_min = np.amin(scaled_points)
+        print("Largest Value:", (current_max, new_max))
+        print("Smallest Value:",(current_min, new_min))
 
 
     
@@ -91,28 +95,25 @@ def make_contreras_snail(label="snail",
 
     # Prepare mesh data
     vertices = points.reshape(-1, 3)  # Flatten the tensor to a list of vertices
-    faces = []
 
     num_rings = len(points)
     points_per_ring = len(points[0])
 
-    # Create faces
-    for ring in range(num_rings - 1):
-        for pt in range(points_per_ring):
-            # Connect point 'pt' in ring 'ring' with the next point and the corresponding points in the next ring
-            p1 = ring * points_per_ring + pt
-            p2 = ring * points_per_ring + (pt + 1) % points_per_ring  # Wrap around to the first point
-            p3 = (ring + 1) * points_per_ring + (pt + 1) % points_per_ring
-            p4 = (ring + 1) * points_per_ring + pt
+    # Create faces, connecting each point in a ring with the next point (wrapping around)
+    # and the corresponding points in the next ring
+    pt = np.arange(points_per_ring)
+    ring_starts = np.arange(num_rings - 1)[:, None] * points_per_ring
+    faces = np.stack([ring_starts + pt,
+                      ring_starts + (pt + 1) % points_per_ring,
+                      ring_starts + points_per_ring + (pt + 1) % points_per_ring,
+                      ring_starts + points_per_ring + pt], axis=-1).reshape(-1, 4)
 
-            faces.append((p1, p2, p3, p4))
-
-    mesh.from_pydata(vertices, [], faces)
+    mesh.from_pydata(vertices, [], faces.tolist())
     mesh.update()
 
-    # Calculate the current max length along the x-axis
-    x_coords = [vert.co.x for vert in mesh.vertices]
-    x_length_current = max(x_coords) - min(x_coords)
+    # Calculate the current max length along the x-axis from the vertex array,
+    # rather than reading every vertex back out of the mesh
+    x_length_current = np.ptp(vertices[:, 0])
 
     # Desired length along the x-axis (based on your 'length' parameter)
     length_desired = length
@@ -125,23 +126,19 @@ def make_contreras_snail(label="snail",
     obj.scale.y *= scale_factor
     obj.scale.z *= scale_factor
 
+    # Set the object to be the active, selected object so the operators below act on it
     bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+
+    # Set the origin to the center of volume (the rotation below doesn't move it, so once is enough)
     bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_VOLUME')
 
-    # Move the object to the global origin
     obj.rotation_euler[1] = np.pi
     if smooth:
-        # Set the object to be the active object
-        bpy.context.view_layer.objects.active = obj
-
-        # Select the object
-        obj.select_set(True)
-
         # Apply smooth shading
         bpy.ops.object.shade_smooth()
-        
-    
-    bpy.ops.object.origin_set(type='ORIGIN_CENTER_OF_VOLUME', center="BOUNDS")
+
+    # Move the object to the global origin
     obj.location = (0, 0, 0)
         
     color_hex = color.lstrip('#')
@@ -162,8 +159,11 @@ def make_contreras_snail(label="snail",
     # Update the scene
     bpy.context.view_layer.update()
 
-make_contreras_snail(label="snail", 
-                         b = 5, d = 3, z = 2, a = 1, phi = 0, psi = 0, 
-                         c_depth=0.3, c_n = 30, n_depth = 0.5, n = 0, 
-                         t = 50, time_step = .25/5, 
-                         points_in_circle=15, length = 1, smooth=True)
\ No newline at end of file
+# Example call when this file is run directly. The guard keeps it from building an extra snail
+# every time TraitBlender loads this script to generate a dataset.
+if __name__ == "__main__":
+    make_contreras_snail(label="snail", 
+                             b = 5, d = 3, z = 2, a = 1, phi = 0, psi = 0, 
+                             c_depth=0.3, c_n = 30, n_depth = 0.5, n = 0, 
+                             t = 50, time_step = .25/5, 
+                             points_in_circle=15, length = 1, smooth=True)
\ No newline at end of file
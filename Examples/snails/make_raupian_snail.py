@@ -13,75 +13,55 @@ def generate_and_mesh_snail(label='snail', W=7, T=1.5, S=1, D=0.1, diameter=3,
     y_0 = 0
         
 
-    def translate_point(theta, r_0, r_c, y_0, W, T, n_points):
-        r_theta = r_0 * (W ** (theta / (2 * np.pi)))
-        y_theta = y_0 * (W ** (theta / (2 * np.pi))) + r_c * (T * (W ** (theta / (2 * np.pi)) - 1))
-        theta = np.full(n_points, theta)
-        return (theta, r_theta, y_theta)
+    def translate_points(thetas, r_0, r_c, y_0, W, T):
+        # One row per circle: the growth factor for each angle, broadcast across the circle's points
+        growth = W ** (thetas[:, None] / (2 * np.pi))
+        r_theta = r_0 * growth
+        y_theta = y_0 * growth + r_c * (T * (growth - 1))
+        return (thetas[:, None], r_theta, y_theta)
 
     def generate_circle_points(r_c, radius, n, S):
-        # Calculate the angle increment
-        angle_increment = 2 * np.pi / n
-        
-        # Initialize coordinate arrays
-        x_coords = np.zeros(n)
-        y_coords = np.zeros(n)
+        # Evenly spaced angles around the circle
+        theta = np.arange(n) * (2 * np.pi / n)
         
         # Calculate new radius for y to maintain the same area after stretching
         y_radius = radius * np.sqrt(S)
         
-        # Generate points
-        for i in range(n):
-            theta = i * angle_increment
-            x_coords[i] = r_c + radius * np.cos(theta)
-            y_coords[i] = y_radius * np.sin(theta)
+        # Generate all points at once
+        x_coords = r_c + radius * np.cos(theta)
+        y_coords = y_radius * np.sin(theta)
         
         return x_coords, y_coords
 
 
-    def cylindrical_to_cartesian(cylindrical_matrices):
-        cartesian_matrices = []
-        
-        for theta_values, r_values, y_values in cylindrical_matrices:
-            x_values = r_values * np.cos(theta_values)
-            y_values_cartesian = r_values * np.sin(theta_values)
-            z_values = y_values  
-            cartesian_matrix = np.array([x_values, y_values_cartesian, z_values])
-            cartesian_matrices.append(cartesian_matrix)
+    def cylindrical_to_cartesian(theta_values, r_values, y_values):
+        x_values = r_values * np.cos(theta_values)
+        y_values_cartesian = r_values * np.sin(theta_values)
+        z_values = y_values
         
-        return np.array(cartesian_matrices)
+        # Shape (n_circles, 3, n_points), one xyz matrix per circle
+        return np.stack([x_values, y_values_cartesian, z_values], axis=1)
 
     r_0s, y_0s = generate_circle_points(r_c, radius, n_points, S)
 
-    points = np.array([translate_point(angle, r_0s, r_c,  y_0s, W, T, n_points) 
-                       for angle in np.linspace(0, n_rotations, num=n_circles)])
+    points = translate_points(np.linspace(0, n_rotations, num=n_circles), r_0s, r_c, y_0s, W, T)
 
-    cartesian_matrices = cylindrical_to_cartesian(points)
+    cartesian_matrices = cylindrical_to_cartesian(*points)
 
     # Clear mesh objects in the scene
-    bpy.ops.object.select_all(action='DESELECT')
-    bpy.ops.object.select_by_type(type='MESH')
-    bpy.ops.object.delete()
-
-    # Initialize empty lists for vertices and faces
-    vertices = []
-    faces = []
-
-    # Populate vertices list
-    for circle in cartesian_matrices:
-        for x, y, z in zip(circle[0], circle[1], circle[2]):
-            vertices.append((x, y, z))
-
-    # Populate faces list
-    n = len(cartesian_matrices[0][0])
-
-    for i in range(len(cartesian_matrices) - 1):
-        for j in range(n):
-            idx1 = i * n + j
-            idx2 = i * n + (j + 1) % n
-            idx3 = (i + 1) * n + (j + 1) % n
-            idx4 = (i + 1) * n + j
-            faces.append((idx1, idx2, idx3, idx4))
+    bpy.data.batch_remove([obj for obj in bpy.context.scene.objects if obj.type == 'MESH'])
+
+    # Vertices, circle by circle, as an (n_circles * n_points, 3) array
+    vertices = cartesian_matrices.transpose(0, 2, 1).reshape(-1, 3)
+
+    # Faces joining each point to its neighbour and the matching points on the next circle
+    n = cartesian_matrices.shape[2]
+    j = np.arange(n)
+    ring_starts = np.arange(len(cartesian_matrices) - 1)[:, None] * n
+    faces = np.stack([ring_starts + j,
+                      ring_starts + (j + 1) % n,
+                      ring_starts + n + (j + 1) % n,
+                      ring_starts + n + j], axis=-1).reshape(-1, 4)
 
     # Create new mesh and link it to scene
     mesh = bpy.data.meshes.new(name=label + "_Mesh")
@@ -93,19 +73,10 @@ def generate_and_mesh_snail(label='snail', W=7, T=1.5, S=1, D=0.1, diameter=3,
     obj.select_set(True)
 
     # Construct the mesh
-    mesh.from_pydata(vertices, [], faces)
+    mesh.from_pydata(vertices, [], faces.tolist())
     mesh.update(calc_edges=True)
 
 
-    # Create a new material
-    mat = bpy.data.materials.new(name=label+"_Material")
-    mat.use_nodes = True
-    nodes = mat.node_tree.nodes
-
-    # Clear default nodes
-    for node in nodes:
-        nodes.remove(node)
-
     # Create a new material
     mat = bpy.data.materials.new(name=f"{label}_Material")
     mat.use_nodes = True
@@ -154,10 +125,8 @@ def generate_and_mesh_snail(label='snail', W=7, T=1.5, S=1, D=0.1, diameter=3,
     # Rotate the object 180 degrees about its local X-axis
     obj.rotation_euler[0] = np.pi  
 
-    # Update the scene
-    bpy.context.view_layer.update()
-
-    obj = bpy.context.active_object
-    scale_factor = diameter / obj.dimensions.x
+    # Scale to the requested diameter. The X extent is read from the vertex coordinates directly
+    # (the rotation about X leaves it unchanged), so no view layer update is needed for obj.dimensions
+    scale_factor = diameter / np.ptp(cartesian_matrices[:, 0])
     obj.scale *= scale_factor
     obj.location = (0, 0, 0)
\ No newline at end of file
@@ -1,10 +1,10 @@
 import bpy
+import bmesh
 import math
 
 def make_snail(label="", coil_fatness=.99, face_height=0.25, degree_of_coiling=12):
     # Delete all objects in the scene
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
+    bpy.data.batch_remove(bpy.context.scene.objects)
 
     # Add a circle mesh
     bpy.ops.mesh.primitive_circle_add(radius=1, enter_editmode=False, align='WORLD', location=(0, 0, 0))
@@ -37,11 +37,13 @@ def make_snail(label="", coil_fatness=.99, face_height=0.25, degree_of_coiling=1
     circle_object.select_set(True)
     bpy.ops.object.modifier_apply(modifier="Array")
 
-    # Enter edit mode, select all edges, and bridge edge loops
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.mesh.bridge_edge_loops()
-    bpy.ops.object.mode_set(mode='OBJECT')
+    # Bridge the edge loops directly on the mesh data, without a round-trip through edit mode
+    bm = bmesh.new()
+    bm.from_mesh(circle_object.data)
+    bmesh.ops.bridge_loops(bm, edges=bm.edges[:])
+    bm.to_mesh(circle_object.data)
+    bm.free()
+    circle_object.data.update()
     bpy.ops.object.shade_smooth()
 
     # Set the origin to the center of mass
@@ -61,6 +63,5 @@ def make_snail(label="", coil_fatness=.99, face_height=0.25, degree_of_coiling=1
     # Deselect all objects
     bpy.ops.object.select_all(action='DESELECT')
 
-    # Select and delete only the Empty object
-    bpy.data.objects['Empty'].select_set(True)
-    bpy.ops.object.delete()
+    # Delete only the Empty object, through the reference kept when it was created
+    bpy.data.objects.remove(empty_object)
@@ -2,6 +2,7 @@
 import bpy
 import json
 import sys
+import types
 bpy.ops.preferences.addon_enable(module="TraitBlender")
 
 # Function to get command-line arguments passed to Blender (skip the first two arguments which are blender related)
@@ -20,11 +21,27 @@ json_file_path = argv[2] if len(argv) > 2 else None
 
 
 def load_settings_from_json(json_path):
-    with open(json_path, 'r') as f:
+    with open(json_path, 'rb') as f:
         settings = json.load(f)
     return settings
 
 
+# Compile the mesh-generating script once and return the first function it defines, so the loop
+# below can call it directly instead of re-reading and re-executing the script for every row
+def load_make_mesh_function(script_path):
+    with open(script_path, 'r') as f:
+        code = compile(f.read(), script_path, 'exec')
+
+    namespace = {'bpy': bpy}
+    exec(code, namespace)
+
+    for func_object in namespace.values():
+        if isinstance(func_object, types.FunctionType) and func_object.__code__.co_filename == script_path:
+            return func_object
+
+    raise ValueError(f"No function found in {script_path}!")
+
+
 # Path to the JSON file containing the settings
 settings = load_settings_from_json(json_file_path)
 
@@ -37,6 +54,7 @@ use_3d_export = settings["Dataset Options"]["use_3d_export"]
 wc_red, wc_green, wc_blue, wc_alpha = settings["World Background Controls"]["wc_colors"]
 
 ## background variable extraction    
+background_plane_image_path = settings["Background Controls"]["background_plane_image_path"]
 background_plane_distance = settings["Background Controls"]["background_plane_distance"]
 bg_scale_x, bg_scale_y, bg_scale_z = settings["Background Controls"]["bg_scales"]
 
@@ -50,6 +68,12 @@ obj_export_directory = settings["obj_export_directory"]
 export_format = settings["export_format"]
 cameras_to_render = settings["Camera Controls"]["Cameras to Render"]
 
+## check the output directories up front, before any specimen is generated
+if use_cameras and render_output_directory == "":
+    raise ValueError("You opted to export images, but didn't include a directory to export to!")
+if use_3d_export and obj_export_directory == "":
+    raise ValueError("You opted to export the 3D object mesh, but didn't include a directory to export to!")
+
 ## Defining the scene
 scene = bpy.data.scenes["Scene"]
 
@@ -58,71 +82,76 @@ scene.csv_file_path = csv_file_path
 scene.make_mesh_function_path = make_mesh_function_path
 
 bpy.ops.object.import_csv()
-tips = bpy.data.scenes['Scene']['tip_labels']
-traits = bpy.data.scenes['Scene']['csv_data']
-mesh_function = bpy.ops.object.execute_with_selected_csv_row
+tips = scene['tip_labels']
+traits = scene['csv_data']
+make_mesh = load_make_mesh_function(make_mesh_function_path)
 
 scene.render_output_directory = render_output_directory
 scene.export_directory = obj_export_directory
-
-for index, label in enumerate(tips):
-
-    scene = bpy.data.scenes["Scene"]
-
-    # Deselect all objects
-    bpy.ops.object.select_all(action='DESELECT')
-
-    # Delete all objects, including hidden ones and lights in all collections
-    for obj in bpy.data.objects:
-        bpy.data.objects.remove(obj)
-    
-    index = str(index)
-    scene.csv_label_props.csv_label_enum = index
-    mesh_function()
-    active_obj = bpy.context.active_object
-    bpy.ops.object.select_all(action='DESELECT')
-    active_obj.select_set(True)
-
-    ## set world color properties
-    scene.world_background_controls.red = wc_red
-    scene.world_background_controls.green = wc_green
-    scene.world_background_controls.blue = wc_blue
-    scene.world_background_controls.alpha = wc_alpha
-    bpy.ops.scene.change_background_color()
+if use_3d_export:
+    scene.export_format = export_format
+
+## property groups written to for every specimen
+world_background_controls = scene.world_background_controls
+background_controls = scene.background_controls
+camera_controls = scene.camera_controls
+
+## set world color properties; the world belongs to the scene and survives the per-specimen
+## object deletion, so this only needs to happen once
+world_background_controls.red = wc_red
+world_background_controls.green = wc_green
+world_background_controls.blue = wc_blue
+world_background_controls.alpha = wc_alpha
+bpy.ops.scene.change_background_color()
+
+## the loop never undoes anything, so don't let every operator call in it push an undo step
+undo_steps = bpy.context.preferences.edit.undo_steps
+bpy.context.preferences.edit.undo_steps = 0
+
+try:
+    for index, label in enumerate(tips):
+
+        # Delete all objects, including hidden ones and lights in all collections
+        bpy.data.batch_remove(bpy.data.objects)
+
+        # Free the meshes, materials, cameras and lights the deleted objects leave behind, so they
+        # don't pile up in memory over the run
+        bpy.data.orphans_purge(do_recursive=True)
     
-    if settings["Background Controls"]["background_plane_image_path"] != "None":
-        bpy.ops.traitblender.import_background_image(filepath=settings["Background Controls"]["background_plane_image_path"])
-        bpy.ops.object.toggle_background_planes()
-        ## set background plane/image properties
-        scene.background_plane_distance = background_plane_distance
-        scene.background_controls.plane_scale_x = bg_scale_x
-        scene.background_controls.plane_scale_y = bg_scale_y
-        scene.background_controls.plane_scale_z = bg_scale_z
-        bpy.ops.object.scale_background_planes()
+        make_mesh(**dict(traits[index]))
+        active_obj = bpy.context.active_object
+        for obj in bpy.context.selected_objects:
+            obj.select_set(False)
+        active_obj.select_set(True)
+
+        if background_plane_image_path != "None":
+            bpy.ops.traitblender.import_background_image(filepath=background_plane_image_path)
+            bpy.ops.object.toggle_background_planes()
+            ## set background plane/image properties
+            scene.background_plane_distance = background_plane_distance
+            background_controls.plane_scale_x = bg_scale_x
+            background_controls.plane_scale_y = bg_scale_y
+            background_controls.plane_scale_z = bg_scale_z
+            bpy.ops.object.scale_background_planes()
         
-    if use_suns:
-        bpy.ops.object.toggle_suns()
-        ## set the strength of the suns
-        scene.sun_strength = sun_strength
-        bpy.ops.object.update_sun_strength()
+        if use_suns:
+            bpy.ops.object.toggle_suns()
+            ## set the strength of the suns
+            scene.sun_strength = sun_strength
+            bpy.ops.object.update_sun_strength()
         
-    if use_cameras:
-        if render_output_directory == "":
-            raise ValueError("You opted to export images, but didn't include a directory to export to!")
-        bpy.ops.object.toggle_cameras()
-        ## set the camera related properties
-        scene.camera_controls.camera_width = camera_width
-        scene.camera_controls.camera_height = camera_height
-        scene.place_cameras_distance = place_cameras_distance
-        scene.camera_controls.focal_length = focal_length
-        bpy.ops.object.render_all_cameras(camera_names=cameras_to_render)
+        if use_cameras:
+            bpy.ops.object.toggle_cameras()
+            ## set the camera related properties
+            camera_controls.camera_width = camera_width
+            camera_controls.camera_height = camera_height
+            scene.place_cameras_distance = place_cameras_distance
+            camera_controls.focal_length = focal_length
+            bpy.ops.object.render_all_cameras(camera_names=cameras_to_render)
         
-    if use_3d_export:
-        if obj_export_directory == "":
-            raise ValueError("You opted to export the 3D object mesh, but didn't include a directory to export to!")
+        if use_3d_export:
+            bpy.ops.object.export_active_object()
+finally:
+    bpy.context.preferences.edit.undo_steps = undo_steps
 
-        ## set 3D object export properties
-        scene.export_format = export_format
-        bpy.ops.object.export_active_object()
-    
 print("Done!")